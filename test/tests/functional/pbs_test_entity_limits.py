@@ -37,6 +37,200 @@
 
 from tests.functional import *
 
+LIMIT = 10
+
+QUEUED_THRESHOLD = 'queued_jobs_threshold'
+QUEUED_THRESHOLD_RES = 'queued_jobs_threshold_res.ncpus'
+MAX_QUEUED = 'max_queued'
+MAX_QUEUED_RES = 'max_queued_res.ncpus'
+
+ENTITY_TAGS = {
+    'gu': 'u:PBS_GENERIC',
+    'u': 'u:%(user)s',
+    'g': 'g:%(grp)s',
+    'gg': 'g:PBS_GENERIC',
+    'p': 'p:p1',
+    'gp': 'p:PBS_GENERIC',
+    'o': 'o:PBS_ALL',
+}
+
+ERR_MSGS = {
+    ('server', 'gu', QUEUED_THRESHOLD):
+        "qsub: would exceed complex's per-user limit of jobs in 'Q' state",
+    ('server', 'u', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for user %(user)s "
+        "already in complex",
+    ('server', 'p', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for project p1 already "
+        "in complex",
+    ('server', 'gp', QUEUED_THRESHOLD):
+        "qsub: would exceed complex's per-project limit of jobs in 'Q' state",
+    ('server', 'g', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for group %(grp)s "
+        "already in complex",
+    ('server', 'gg', QUEUED_THRESHOLD):
+        "qsub: would exceed complex's per-group limit of jobs in 'Q' state",
+    ('server', 'o', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state already in complex",
+    ('queue', 'gu', QUEUED_THRESHOLD):
+        "qsub: would exceed queue generic's per-user limit of jobs in 'Q' "
+        "state",
+    ('queue', 'u', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for user %(user)s "
+        "already in queue %(queue)s",
+    ('queue', 'g', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for group %(grp)s "
+        "already in queue %(queue)s",
+    ('queue', 'p', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state for project p1 already "
+        "in queue %(queue)s",
+    ('queue', 'gp', QUEUED_THRESHOLD):
+        "qsub: would exceed queue %(queue)s's per-project limit of jobs in "
+        "'Q' state",
+    ('queue', 'gg', QUEUED_THRESHOLD):
+        "qsub: would exceed queue %(queue)s's per-group limit of jobs in "
+        "'Q' state",
+    ('queue', 'o', QUEUED_THRESHOLD):
+        "qsub: Maximum number of jobs in 'Q' state already in queue "
+        "%(queue)s",
+    ('server', 'gu', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-user limit on resource ncpus in complex for "
+        "jobs in 'Q' state",
+    ('server', 'u', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed user %(user)s's limit on resource ncpus in "
+        "complex for jobs in 'Q' state",
+    ('server', 'gg', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-group limit on resource ncpus in complex "
+        "for jobs in 'Q' state",
+    ('server', 'p', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed project p1's limit on resource ncpus in complex "
+        "for jobs in 'Q' state",
+    ('server', 'gp', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-project limit on resource ncpus in complex "
+        "for jobs in 'Q' state",
+    ('server', 'g', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed group %(grp)s's limit on resource ncpus in "
+        "complex for jobs in 'Q' state",
+    ('server', 'o', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed limit on resource ncpus in complex for jobs in "
+        "'Q' state",
+    ('queue', 'gu', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-user limit on resource ncpus in queue "
+        "%(queue)s for jobs in 'Q' state",
+    ('queue', 'u', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed user %(user)s's limit on resource ncpus in "
+        "queue %(queue)s for jobs in 'Q' state",
+    ('queue', 'g', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed group %(grp)s's limit on resource ncpus in "
+        "queue %(queue)s for jobs in 'Q' state",
+    ('queue', 'gg', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-group limit on resource ncpus in queue "
+        "%(queue)s for jobs in 'Q' state",
+    ('queue', 'p', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed project p1's limit on resource ncpus in queue "
+        "%(queue)s for jobs in 'Q' state",
+    ('queue', 'gp', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed per-project limit on resource ncpus in queue "
+        "%(queue)s for jobs in 'Q' state",
+    ('queue', 'o', QUEUED_THRESHOLD_RES):
+        "qsub: would exceed limit on resource ncpus in queue %(queue)s for "
+        "jobs in 'Q' state",
+    ('server', 'gu', MAX_QUEUED):
+        "qsub: would exceed complex's per-user limit",
+    ('server', 'u', MAX_QUEUED):
+        "qsub: Maximum number of jobs for user %(user)s already in complex",
+    ('server', 'p', MAX_QUEUED):
+        "qsub: Maximum number of jobs for project p1 already in complex",
+    ('server', 'gp', MAX_QUEUED):
+        "qsub: would exceed complex's per-project limit",
+    ('server', 'g', MAX_QUEUED):
+        "qsub: Maximum number of jobs for group %(grp)s already in complex",
+    ('server', 'gg', MAX_QUEUED):
+        "qsub: would exceed complex's per-group limit",
+    ('server', 'o', MAX_QUEUED):
+        "qsub: Maximum number of jobs already in complex",
+    ('queue', 'gu', MAX_QUEUED):
+        "qsub: would exceed queue generic's per-user limit",
+    ('queue', 'u', MAX_QUEUED):
+        "qsub: Maximum number of jobs for user %(user)s already in queue "
+        "%(queue)s",
+    ('queue', 'g', MAX_QUEUED):
+        "qsub: Maximum number of jobs for group %(grp)s already in queue "
+        "%(queue)s",
+    ('queue', 'p', MAX_QUEUED):
+        "qsub: Maximum number of jobs for project p1 already in queue "
+        "%(queue)s",
+    ('queue', 'gp', MAX_QUEUED):
+        "qsub: would exceed queue %(queue)s's per-project limit",
+    ('queue', 'gg', MAX_QUEUED):
+        "qsub: would exceed queue %(queue)s's per-group limit",
+    ('queue', 'o', MAX_QUEUED):
+        "qsub: Maximum number of jobs already in queue %(queue)s",
+    ('server', 'gu', MAX_QUEUED_RES):
+        "qsub: would exceed per-user limit on resource ncpus in complex",
+    ('server', 'u', MAX_QUEUED_RES):
+        "qsub: would exceed user %(user)s's limit on resource ncpus in "
+        "complex",
+    ('server', 'gg', MAX_QUEUED_RES):
+        "qsub: would exceed per-group limit on resource ncpus in complex",
+    ('server', 'p', MAX_QUEUED_RES):
+        "qsub: would exceed project p1's limit on resource ncpus in complex",
+    ('server', 'gp', MAX_QUEUED_RES):
+        "qsub: would exceed per-project limit on resource ncpus in complex",
+    ('server', 'g', MAX_QUEUED_RES):
+        "qsub: would exceed group %(grp)s's limit on resource ncpus in "
+        "complex",
+    ('server', 'o', MAX_QUEUED_RES):
+        "qsub: would exceed limit on resource ncpus in complex",
+    ('queue', 'gu', MAX_QUEUED_RES):
+        "qsub: would exceed per-user limit on resource ncpus in queue "
+        "%(queue)s",
+    ('queue', 'u', MAX_QUEUED_RES):
+        "qsub: would exceed user %(user)s's limit on resource ncpus in "
+        "queue %(queue)s",
+    ('queue', 'g', MAX_QUEUED_RES):
+        "qsub: would exceed group %(grp)s's limit on resource ncpus in "
+        "queue %(queue)s",
+    ('queue', 'gg', MAX_QUEUED_RES):
+        "qsub: would exceed per-group limit on resource ncpus in queue "
+        "%(queue)s",
+    ('queue', 'p', MAX_QUEUED_RES):
+        "qsub: would exceed project p1's limit on resource ncpus in queue "
+        "%(queue)s",
+    ('queue', 'gp', MAX_QUEUED_RES):
+        "qsub: would exceed per-project limit on resource ncpus in queue "
+        "%(queue)s",
+    ('queue', 'o', MAX_QUEUED_RES):
+        "qsub: would exceed limit on resource ncpus in queue %(queue)s",
+}
+
+
+ENTITY_NAMES = {
+    'gu': ('generic_user', 'any user'),
+    'u': ('user', 'user %s' % TEST_USER),
+    'g': ('group', 'group %s' % TSTGRP0),
+    'gg': ('generic_group', 'any group'),
+    'p': ('project', 'project p1'),
+    'gp': ('generic_project', 'any project'),
+    'o': ('overall', 'any entity'),
+}
+
+LIMIT_SUFFIXES = [
+    (QUEUED_THRESHOLD, 'queued'),
+    (QUEUED_THRESHOLD_RES, 'res_queued'),
+    (MAX_QUEUED, 'max'),
+    (MAX_QUEUED_RES, 'res_max'),
+]
+
+
+def _msg_re(msg):
+    """
+    Compile an expected qsub error message into a regular expression
+    that matches it verbatim but tolerates whitespace differences.
+    """
+    pat = re.escape(msg).replace(r'\ ', ' ')
+    return re.compile(pat.replace(' ', r'\s+'))
+
 
 class TestEntityLimits(TestFunctional):
 
@@ -50,7 +244,9 @@ class TestEntityLimits(TestFunctional):
 
     """
 
-    limit = 10
+    _errs = None
+    _tags = None
+    _limit_sets = None
 
     def setUp(self):
         TestFunctional.setUp(self)
@@ -58,697 +254,110 @@ class TestEntityLimits(TestFunctional):
         a = {'resources_available.ncpus': 1}
         self.server.manager(MGR_CMD_SET, NODE, a, self.mom.shortname)
 
+        self._dq = self.server.default_queue
+        self._user = str(TEST_USER)
+        self._grp = str(TSTGRP0)
+
+        cls = type(self)
+        if cls._errs is None:
+            vals = {'user': self._user, 'grp': self._grp, 'queue': self._dq}
+            cls._tags = dict((k, v % vals) for k, v in ENTITY_TAGS.items())
+            cls._errs = dict((k, _msg_re(v % vals))
+                             for k, v in ERR_MSGS.items())
+            cls._limit_sets = dict(
+                ((k, a), {a: "[%s=%d]" % (t, LIMIT)})
+                for k, t in cls._tags.items()
+                for a in (QUEUED_THRESHOLD, QUEUED_THRESHOLD_RES,
+                          MAX_QUEUED, MAX_QUEUED_RES))
+
+    def _expect_reject(self, j, exp_err, what="Job violating limits"):
+        """
+        Submit a job expecting it to be rejected with message exp_err,
+        given verbatim or as a compiled regular expression.  Fail if
+        the job is accepted or rejected with a different message.
+        """
+        if isinstance(exp_err, str):
+            exp_err = _msg_re(exp_err)
+        try:
+            self.server.submit(j)
+        except PbsSubmitError as e:
+            if not exp_err.fullmatch(e.msg[0]):
+                raise self.failureException(
+                    "rcvd unexpected err message: %s" % e.msg[0])
+        else:
+            self.assertFalse(True, "%s got submitted." % what)
+
+    def _submit_fill_array(self, job_attr, n):
+        """
+        Submit a single n-wide array job to fill an entity limit.
+        Subjobs are charged against entity limits like individual
+        jobs, so this replaces n separate submissions with one.
+        """
+        attr = dict(job_attr)
+        attr[ATTR_J] = "1-%d" % n
+        return self.server.submit(Job(TEST_USER, attr))
+
     def common_limit_test(self, server, entstr, job_attr={}, queued=False,
-                          exp_err=''):
+                          *, exp_err, restart=False):
         if not server:
-            qname = self.server.default_queue
+            qname = self._dq
             self.server.manager(MGR_CMD_SET, QUEUE, entstr, qname)
         else:
             self.server.manager(MGR_CMD_SET, SERVER, entstr)
 
+        j = Job(TEST_USER, job_attr)
+
         if queued:
-            j = Job(TEST_USER, job_attr)
             jid = self.server.submit(j)
             self.server.expect(JOB, {'job_state': 'R'}, id=jid)
 
-        for _ in range(self.limit):
-            j = Job(TEST_USER, job_attr)
-            self.server.submit(j)
+        self._submit_fill_array(job_attr, LIMIT)
 
-        try:
-            j = Job(TEST_USER, job_attr)
-            self.server.submit(j)
-        except PbsSubmitError as e:
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Job violating limits got submitted.")
+        self._expect_reject(j, exp_err)
 
         self.server.cleanup_jobs()
 
-        try:
-            jval = "1-" + str(self.limit + 1)
-            job_attr[ATTR_J] = jval
-            j = Job(TEST_USER, job_attr)
-            jid = self.server.submit(j)
-        except PbsSubmitError as e:
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Array Job violating limits got submitted.")
-
-        jval = "1-" + str(self.limit)
-        job_attr[ATTR_J] = jval
+        array_attr = dict(job_attr)
+        array_attr[ATTR_J] = "1-%d" % (LIMIT + 1)
+        ja = Job(TEST_USER, array_attr)
+        self._expect_reject(ja, exp_err, "Array Job violating limits")
 
-        j = Job(TEST_USER, job_attr)
-        jid = self.server.submit(j)
+        array_attr[ATTR_J] = "1-%d" % LIMIT
+        ja = Job(TEST_USER, array_attr)
+        jid = self.server.submit(ja)
         self.server.expect(JOB, {'job_state': 'B'}, id=jid)
 
-        del job_attr[ATTR_J]
-
         if queued:
-            j = Job(TEST_USER, job_attr)
             self.server.submit(j)
 
-        try:
-            j = Job(TEST_USER, job_attr)
-            self.server.submit(j)
-        except PbsSubmitError as e:
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Job violating limits got submitted.")
+        if not restart:
+            self._expect_reject(j, exp_err)
+            return
 
         self.server.restart()
 
-        try:
-            self.server.submit(j)
-        except PbsSubmitError as e:
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Job violating limits got submitted after "
-                             "server restart.")
-
-    def test_server_generic_user_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any user at the server level.
-        """
-        a = {"queued_jobs_threshold":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        m = "qsub: would exceed complex's per-user limit of jobs in 'Q' state"
-        self.common_limit_test(True, a, queued=True, exp_err=m)
-
-    def test_server_user_limits_queued(self):
-        """
-        Test queued_jobs_threshold for user TEST_USER at the server level.
-        """
-        a = {"queued_jobs_threshold":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for user " + \
-            str(TEST_USER) + ' already in complex'
-        self.common_limit_test(True, a, queued=True, exp_err=errmsg)
-
-    def test_server_project_limits_queued(self):
-        """
-        Test queued_jobs_threshold for project p1 at the server level.
-        """
-        a = {"queued_jobs_threshold": "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_project: 'p1'}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for project p1 " \
-            + "already in complex"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_generic_project_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any project at the server level.
-        """
-        a = {"queued_jobs_threshold":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        errmsg = "qsub: would exceed complex's per-project limit of jobs in " \
-            + "'Q' state"
-        self.common_limit_test(True, a, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_group_limits_queued(self):
-        """
-        Test queued_jobs_threshold for group TSTGRP0 at the server level.
-        """
-        a = {"queued_jobs_threshold":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for group " + \
-            str(TSTGRP0) + ' already in complex'
-        self.common_limit_test(True, a, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_generic_group_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any group at the server level.
-        """
-        a = {"queued_jobs_threshold":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        m = "qsub: would exceed complex's per-group limit of jobs in 'Q' state"
-        self.common_limit_test(True, a, queued=True, exp_err=m)
-
-    def test_server_overall_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any entity at the server level.
-        """
-        a = {"queued_jobs_threshold": "[o:PBS_ALL=" + str(self.limit) + "]"}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state already in complex"
-        self.common_limit_test(True, a, queued=True, exp_err=errmsg)
-
-    def test_queue_generic_user_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any user for the default queue.
-        """
-        a = {"queued_jobs_threshold":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = "qsub: would exceed queue generic's per-user limit of " \
-            + "jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_user_limits_queued(self):
-        """
-        Test queued_jobs_threshold for user pbsuser1 for the default queue.
-        """
-        a = {"queued_jobs_threshold":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for user " + \
-            str(TEST_USER) + ' already in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_group_limits_queued(self):
-        """
-        Test queued_jobs_threshold for group TSTGRP0 for the default queue.
-        """
-        a = {"queued_jobs_threshold":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for group " + \
-            str(TSTGRP0) + ' already in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_project_limits_queued(self):
-        """
-        Test queued_jobs_threshold for project p1 for the default queue.
-        """
-        a = {"queued_jobs_threshold": "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue, ATTR_project: 'p1'}
-        errmsg = "qsub: Maximum number of jobs in 'Q' state for project p1 " \
-            'already in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_generic_project_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any project for the default queue.
-        """
-        a = {"queued_jobs_threshold":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: would exceed queue ' + self.server.default_queue + \
-            "'s per-project limit of jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_generic_group_limits_queued(self):
-        """
-        Test queued_jobs_threshold for any group for the default queue.
-        """
-        a = {"queued_jobs_threshold":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: would exceed queue ' + self.server.default_queue + \
-            "'s per-group limit of jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_overall_limits_queued(self):
-        """
-        Test queued_jobs_threshold for all entities for the default queue.
-        """
-        a = {"queued_jobs_threshold": "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        emsg = "qsub: Maximum number of jobs in 'Q' state already in queue " \
-            + self.server.default_queue
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=emsg)
+        self._expect_reject(j, exp_err,
+                            "Job violating limits after server restart")
 
-    def test_server_generic_user_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any user at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-user limit on resource ncpus in ' \
-            + "complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_user_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for user pbsuser1 at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed user ' + str(TEST_USER) + \
-            "'s limit on resource ncpus in complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_generic_group_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any group at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-group limit on resource ncpus in '\
-            + "complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_project_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for project p1 at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_project: 'p1', 'Resource_List.select': '1:ncpus=1'}
-        errmsg = "qsub: would exceed project p1's limit on resource ncpus in" \
-            + " complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_generic_project_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any project at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-project limit on resource ncpus in ' \
-            + "complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_group_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for group pbsuser1 at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed group ' + str(TSTGRP0) + \
-            "'s limit on resource ncpus in complex for jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_overall_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for all entities at the server level.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed limit on resource ncpus in complex for '\
-            + "jobs in 'Q' state"
-        self.common_limit_test(True, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_generic_user_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for all users for the default queue.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        emsg = 'qsub: would exceed per-user limit on resource ncpus in queue '\
-            + self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=emsg)
-
-    def test_queue_user_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for user pbsuser1 for the default queue.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed user ' + str(TEST_USER) + \
-            "'s limit on resource ncpus in queue " + \
-            self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_group_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for group pbsuser1 for the default queue
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed group ' + str(TSTGRP0) + \
-            "'s limit on resource ncpus in queue " + \
-            self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_generic_group_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any group for the default queue.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-group limit on resource ncpus in ' \
-            + 'queue ' + self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_project_limits_res_queued(self):
+    def _run_limit_test(self, scope, entity, limit_attr, restart=False):
         """
-        Test queued_jobs_threshold_res for project p1 for the default queue.
+        Configure limit_attr for the given entity key at the given scope
+        ('server' or 'queue') and run common_limit_test, expecting the
+        matching ERR_MSGS entry once the limit is exceeded.
         """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 ATTR_project: 'p1', 'Resource_List.select': '1:ncpus=1'}
-        errmsg = "qsub: would exceed project p1's limit on resource ncpus " + \
-            'in queue ' + self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_generic_project_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any project for the default queue.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-project limit on resource ncpus in' \
-            + ' queue ' + self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_queue_overall_limits_res_queued(self):
-        """
-        Test queued_jobs_threshold_res for any entity for the default queue.
-        """
-        a = {"queued_jobs_threshold_res.ncpus":
-             "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed limit on resource ncpus in queue ' + \
-            self.server.default_queue + " for jobs in 'Q' state"
-        self.common_limit_test(False, a, attrs, queued=True, exp_err=errmsg)
-
-    def test_server_generic_user_limits_max(self):
-        """
-        Test max_queued for any user at the server level.
-        """
-        a = {"max_queued":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        errmsg = "qsub: would exceed complex's per-user limit"
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    def test_server_user_limits_max(self):
-        """
-        Test max_queued for user pbsuser1 at the server level.
-        """
-        a = {"max_queued":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        errmsg = 'qsub: Maximum number of jobs for user ' + str(TEST_USER) + \
-            ' already in complex'
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    def test_server_project_limits_max(self):
-        """
-        Test max_queued for project p1 at the server level.
-        """
-        a = {"max_queued": "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_project: 'p1'}
-        msg = 'qsub: Maximum number of jobs for project p1 already in complex'
-        self.common_limit_test(True, a, attrs, exp_err=msg)
-
-    def test_server_generic_project_limits_max(self):
-        """
-        Test max_queued for any project at the server level.
-        """
-        a = {"max_queued":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        errmsg = "qsub: would exceed complex's per-project limit"
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_group_limits_max(self):
-        """
-        Test max_queued for group TSTGRP0 at the server level.
-        """
-        a = {"max_queued":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        errmsg = 'qsub: Maximum number of jobs for group ' + str(TSTGRP0) + \
-            ' already in complex'
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_generic_group_limits_max(self):
-        """
-        Test max_queued for any group at the server level.
-        """
-        a = {"max_queued":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        errmsg = "qsub: would exceed complex's per-group limit"
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    def test_server_overall_limits_max(self):
-        """
-        Test max_queued for any entity at the server level.
-        """
-        a = {"max_queued": "[o:PBS_ALL=" + str(self.limit) + "]"}
-        errmsg = 'qsub: Maximum number of jobs already in complex'
-        self.common_limit_test(True, a, exp_err=errmsg)
-
-    def test_queue_generic_user_limits_max(self):
-        """
-        Test max_queued for any user for the default queue.
-        """
-        a = {"max_queued":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = "qsub: would exceed queue generic's per-user limit"
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_user_limits_max(self):
-        """
-        Test max_queued for user pbsuser1 for the default queue.
-        """
-        a = {"max_queued":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: Maximum number of jobs for user ' + str(TEST_USER) + \
-            ' already in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_group_limits_max(self):
-        """
-        Test max_queued for group pbsuser1 for the default queue.
-        """
-        a = {"max_queued":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: Maximum number of jobs for group ' + str(TSTGRP0) + \
-            ' already in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_project_limits_max(self):
-        """
-        Test max_queued for project p1 for the default queue.
-        """
-        a = {"max_queued": "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue, ATTR_project: 'p1'}
-        msg = 'qsub: Maximum number of jobs for project p1 already in queue '\
-            + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=msg)
-
-    def test_queue_generic_project_limits_max(self):
-        """
-        Test max_queued for any project for the default queue.
-        """
-        a = {"max_queued":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: would exceed queue ' + self.server.default_queue + \
-            "'s per-project limit"
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_generic_group_limits_max(self):
-        """
-        Test max_queued for any group for the default queue.
-        """
-        a = {"max_queued":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: would exceed queue ' + self.server.default_queue + \
-            "'s per-group limit"
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_overall_limits_max(self):
-        """
-        Test max_queued for all entities for the default queue.
-        """
-        a = {"max_queued": "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue}
-        errmsg = 'qsub: Maximum number of jobs already in queue ' + \
-            self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_server_generic_user_limits_res_max(self):
-        """
-        Test max_queued_res for any user at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        emsg = 'qsub: would exceed per-user limit on resource ncpus in complex'
-        self.common_limit_test(True, a, attrs, exp_err=emsg)
-
-    def test_server_user_limits_res_max(self):
-        """
-        Test max_queued_res for user pbsuser1 at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed user ' + str(TEST_USER) + \
-            "'s limit on resource ncpus in complex"
-        self.common_limit_test(True, a, attrs, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_server_generic_group_limits_res_max(self):
-        """
-        Test max_queued_res for any group at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        msg = 'qsub: would exceed per-group limit on resource ncpus in complex'
-        self.common_limit_test(True, a, attrs, exp_err=msg)
-
-    def test_server_project_limits_res_max(self):
-        """
-        Test max_queued_res for project p1 at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_project: 'p1', 'Resource_List.select': '1:ncpus=1'}
-        errmsg = "qsub: would exceed project p1's limit on resource ncpus in" \
-            + " complex"
-        self.common_limit_test(True, a, attrs, exp_err=errmsg)
-
-    def test_server_generic_project_limits_res_max(self):
-        """
-        Test max_queued_res for any project at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        m = 'qsub: would exceed per-project limit on resource ncpus in complex'
-        self.common_limit_test(True, a, attrs, exp_err=m)
-
-    @skipOnShasta
-    def test_server_group_limits_res_max(self):
-        """
-        Test max_queued_res for group pbsuser1 at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed group ' + str(TSTGRP0) + \
-            "'s limit on resource ncpus in complex"
-        self.common_limit_test(True, a, attrs, exp_err=errmsg)
-
-    def test_server_overall_limits_res_max(self):
-        """
-        Test max_queued_res for all entities at the server level.
-        """
-        a = {"max_queued_res.ncpus":
-             "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed limit on resource ncpus in complex'
-        self.common_limit_test(True, a, attrs, exp_err=errmsg)
-
-    def test_queue_generic_user_limits_res_max(self):
-        """
-        Test max_queued_res for all users for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[u:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-user limit on resource ncpus in' \
-            + ' queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_user_limits_res_max(self):
-        """
-        Test max_queued_res for user pbsuser1 for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[u:" + str(TEST_USER) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed user ' + str(TEST_USER) + \
-            "'s limit on resource ncpus in queue " + \
-            self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_group_limits_res_max(self):
-        """
-        Test max_queued_res for group pbsuser1 for the default queue
-        """
-        a = {"max_queued_res.ncpus":
-             "[g:" + str(TSTGRP0) + "=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed group ' + str(TSTGRP0) + \
-            "'s limit on resource ncpus in queue " + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    @skipOnShasta
-    def test_queue_generic_group_limits_res_max(self):
-        """
-        Test max_queued_res for any group for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[g:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-group limit on resource ncpus in' \
-            + ' queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_project_limits_res_max(self):
-        """
-        Test max_queued_res for project p1 for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[p:p1=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 ATTR_project: 'p1', 'Resource_List.select': '1:ncpus=1'}
-        errmsg = "qsub: would exceed project p1's limit on resource ncpus" + \
-            ' in queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_generic_project_limits_res_max(self):
-        """
-        Test max_queued_res for any project for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[p:PBS_GENERIC=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed per-project limit on resource ncpus in' \
-            + ' queue ' + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
-
-    def test_queue_overall_limits_res_max(self):
-        """
-        Test max_queued_res for any entity for the default queue.
-        """
-        a = {"max_queued_res.ncpus":
-             "[o:PBS_ALL=" + str(self.limit) + "]"}
-        attrs = {ATTR_queue: self.server.default_queue,
-                 'Resource_List.select': '1:ncpus=1'}
-        errmsg = 'qsub: would exceed limit on resource ncpus in queue ' \
-                 + self.server.default_queue
-        self.common_limit_test(False, a, attrs, exp_err=errmsg)
+        server = scope == 'server'
+        entstr = self._limit_sets[(entity, limit_attr)]
+        job_attr = {}
+        if not server:
+            job_attr[ATTR_queue] = self._dq
+        if entity == 'p':
+            job_attr[ATTR_project] = 'p1'
+        if limit_attr in (QUEUED_THRESHOLD_RES, MAX_QUEUED_RES):
+            job_attr['Resource_List.select'] = '1:ncpus=1'
+        queued = limit_attr in (QUEUED_THRESHOLD, QUEUED_THRESHOLD_RES)
+        self.common_limit_test(server, entstr, job_attr, queued=queued,
+                               exp_err=self._errs[(scope, entity, limit_attr)],
+                               restart=restart)
 
     def test_qalter_resource(self):
         """
@@ -756,29 +365,27 @@ class TestEntityLimits(TestFunctional):
         """
         res_name = 'res_long'
         res_attr = {ATTR_RESC_TYPE: 'long', ATTR_RESC_FLAG: 'q'}
-        rc = self.server.manager(MGR_CMD_CREATE, RSC, res_attr, id=res_name)
+        try:
+            self.server.status(RSC, id=res_name)
+        except PbsStatusError:
+            self.server.manager(MGR_CMD_CREATE, RSC, res_attr, id=res_name)
 
-        a = {"max_queued_res." + res_name:
-             "[o:PBS_ALL=" + str(self.limit) + "]"}
-        qname = self.server.default_queue
+        a = {"max_queued_res.%s" % res_name: "[o:PBS_ALL=%d]" % LIMIT}
+        qname = self._dq
         self.server.manager(MGR_CMD_SET, QUEUE, a, qname)
 
         self.server.manager(MGR_CMD_SET, SERVER, {ATTR_scheduling: 'False'})
 
+        exp_err = ("qsub: would exceed limit on resource %s in queue %s"
+                   % (res_name, qname))
+
         attrs = {ATTR_queue: qname, 'Resource_List.' + res_name: 9}
         j_1 = Job(TEST_USER, attrs)
         J_1_id = self.server.submit(j_1)
 
-        try:
-            attrs = {ATTR_queue: qname, 'Resource_List.' + res_name: 2}
-            j_2 = Job(TEST_USER, attrs)
-            self.server.submit(j_2)
-        except PbsSubmitError as e:
-            exp_err = 'qsub: would exceed limit on resource ' + res_name + \
-                ' in queue ' + qname
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
+        attrs = {ATTR_queue: qname, 'Resource_List.' + res_name: 2}
+        j_2 = Job(TEST_USER, attrs)
+        self._expect_reject(j_2, exp_err)
 
         attribs = {'Resource_List.' + res_name: 8}
         self.server.alterjob(J_1_id, attribs)
@@ -786,31 +393,19 @@ class TestEntityLimits(TestFunctional):
 
         self.server.submit(j_2)
 
-        try:
-            attrs = {ATTR_queue: qname, 'Resource_List.' + res_name: 1}
-            j_3 = Job(TEST_USER, attrs)
-            self.server.submit(j_3)
-        except PbsSubmitError as e:
-            exp_err = 'qsub: would exceed limit on resource ' + res_name + \
-                ' in queue ' + qname
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
+        attrs = {ATTR_queue: qname, 'Resource_List.' + res_name: 1}
+        j_3 = Job(TEST_USER, attrs)
+        self._expect_reject(j_3, exp_err)
 
     def test_multiple_queued_limits(self):
-        defqname = self.server.default_queue
+        defqname = self._dq
         q2name = 'q2'
-        a = OrderedDict()
-        a['queue_type'] = 'execution'
-        a['enabled'] = 'True'
-        a['started'] = 'True'
+        a = {'queue_type': 'execution', 'enabled': 'True', 'started': 'True'}
         self.server.manager(MGR_CMD_CREATE, QUEUE, a, id=q2name)
 
-        a = {"queued_jobs_threshold":
-             "[u:PBS_GENERIC=10]"}
+        a = {QUEUED_THRESHOLD: "[u:PBS_GENERIC=10]"}
         self.server.manager(MGR_CMD_SET, SERVER, a)
-        a = {"queued_jobs_threshold":
-             "[u:PBS_GENERIC=5]"}
+        a = {QUEUED_THRESHOLD: "[u:PBS_GENERIC=5]"}
         self.server.manager(MGR_CMD_SET, QUEUE, a, defqname)
         jd = Job(TEST_USER, {ATTR_queue: defqname})
         j2 = Job(TEST_USER, {ATTR_queue: q2name})
@@ -818,31 +413,39 @@ class TestEntityLimits(TestFunctional):
         jid = self.server.submit(jd)
         self.server.expect(JOB, {'job_state': 'R'}, id=jid)
 
-        for _ in range(5):
-            jd = Job(TEST_USER, {ATTR_queue: defqname})
-            self.server.submit(jd)
+        self._submit_fill_array({ATTR_queue: defqname}, 5)
 
-        try:
-            self.server.submit(jd)
-        except PbsSubmitError as e:
-            exp_err = "qsub: would exceed queue generic's per-user limit " + \
-                "of jobs in 'Q' state"
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Job violating limits got submitted.")
+        self._expect_reject(jd, ERR_MSGS[('queue', 'gu', QUEUED_THRESHOLD)])
 
-        for _ in range(5):
-            self.server.submit(j2)
+        self._submit_fill_array({ATTR_queue: q2name}, 5)
 
-        try:
-            self.server.submit(j2)
-        except PbsSubmitError as e:
-            exp_err = "qsub: would exceed complex's per-user limit of " + \
-                "jobs in 'Q' state"
-            if e.msg[0] != exp_err:
-                raise self.failureException("rcvd unexpected err message: " +
-                                            e.msg[0])
-        else:
-            self.assertFalse(True, "Job violating limits got submitted.")
+        self._expect_reject(j2, ERR_MSGS[('server', 'gu', QUEUED_THRESHOLD)])
+
+
+def _make_limit_test(name, scope, entkey, limit_attr, restart):
+    """
+    Build a test method exercising limit_attr for the given entity key
+    at the given scope.  Group tests are skipped on Cray Shasta like
+    their previously hand-written counterparts.
+    """
+    def test(self):
+        self._run_limit_test(scope, entkey, limit_attr, restart=restart)
+    test.__name__ = name
+    where = ('at the server level' if scope == 'server'
+             else 'for the default queue')
+    test.__doc__ = """
+        Test %s for %s %s.
+        """ % (limit_attr.split('.')[0], ENTITY_NAMES[entkey][1], where)
+    if entkey in ('g', 'gg'):
+        test = skipOnShasta(test)
+    return test
+
+
+for _scope in ('server', 'queue'):
+    for _attr, _suffix in LIMIT_SUFFIXES:
+        for _ent, (_name, _) in ENTITY_NAMES.items():
+            _testname = 'test_%s_%s_limits_%s' % (_scope, _name, _suffix)
+            _restart = _scope == 'server' and _ent == 'u'
+            setattr(TestEntityLimits, _testname,
+                    _make_limit_test(_testname, _scope, _ent, _attr,
+                                     _restart))